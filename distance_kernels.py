@@ -0,0 +1,47 @@
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def l2sq_argmin(known, encoding):
+    """
+    Fused squared-distance scan over the known encodings
+    Returns: tuple (best_index, best_squared_distance)
+    """
+    n = known.shape[0]
+    distances = np.empty(n, dtype=np.float32)
+    for i in prange(n):
+        total = np.float32(0.0)
+        for j in range(known.shape[1]):
+            d = known[i, j] - encoding[j]
+            total += d * d
+        distances[i] = total
+    
+    # Rows are scored in parallel; the argmin is serial to avoid a race
+    best = 0
+    for i in range(1, n):
+        if distances[i] < distances[best]:
+            best = i
+    return best, distances[best]
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def l2sq_argmin_int8(known, encoding):
+    """
+    Same as l2sq_argmin for int8 encodings, accumulating in int32
+    Returns: tuple (best_index, best_squared_distance)
+    """
+    n = known.shape[0]
+    distances = np.empty(n, dtype=np.int32)
+    for i in prange(n):
+        total = np.int32(0)
+        for j in range(known.shape[1]):
+            d = np.int32(known[i, j]) - np.int32(encoding[j])
+            total += d * d
+        distances[i] = total
+    
+    best = 0
+    for i in range(1, n):
+        if distances[i] < distances[best]:
+            best = i
+    return best, distances[best]
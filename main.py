@@ -1,22 +1,100 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor
 import cv2
+import dlib
 import face_recognition
 import pandas as pd
 from datetime import datetime
 import os
 import numpy as np
+import xlsxwriter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    import simsimd
+except ImportError:  # SimSIMD is optional; NumPy is used without it
+    simsimd = None  # type: ignore[assignment]
+
+try:
+    # Kept in its own module so main.py can be compiled with mypyc;
+    # Numba cannot JIT functions that mypyc has already compiled
+    import distance_kernels
+except ImportError:  # Numba is optional; NumPy is used without it
+    distance_kernels = None  # type: ignore[assignment]
+
+ATTENDANCE_COLUMNS = ["Roll No", "Name", "Date", "Time"]
+
+# (filename, mtime_ns, size) identifies an unchanged known-face image
+Fingerprint = Tuple[str, int, int]
+
+# Cached in place of an encoding for images where no face was found,
+# so they are not run through the detector again on the next start
+NO_FACE = np.full(128, np.nan, dtype=np.float32)
+
+# Padding rows are filled with this value so they are never the closest match.
+# It is finite on purpose: inf would turn the norm-based distances into NaN.
+PAD_VALUE = 1e4
+
+
+def encode_image_file(item: Tuple[Fingerprint, str]) -> Optional[np.ndarray]:
+    """
+    Encode the first face in a single image file
+    Module-level so it can run in a worker process
+    item: tuple (fingerprint, filepath)
+    Returns: the encoding, NO_FACE if no face was found, or None on error
+    """
+    key, filepath = item
+    try:
+        image = AttendanceSystem.load_rgb_image(filepath)
+        encodings = face_recognition.face_encodings(image)
+        
+        if len(encodings) > 0:
+            return encodings[0]
+        print(f"✗ No face detected in: {key[0]}")
+        return NO_FACE
+    except Exception as e:
+        print(f"✗ Error loading {key[0]}: {str(e)}")
+    return None
+
 
 class AttendanceSystem:
-    def __init__(self, known_faces_dir, attendance_file='attendance.xlsx'):
+    def __init__(self, known_faces_dir: str, attendance_file: str = 'attendance.csv',
+                 cache_file: str = 'known_faces.npz', excel_file: str = 'attendance.xlsx',
+                 use_int8: bool = False) -> None:
         """
         Initialize the attendance system with known faces directory
+        attendance_file: Append-only CSV log of attendance records
+        cache_file: Where computed face encodings are stored between runs
+        excel_file: Where export_xlsx() writes the Excel copy of the log
+        use_int8: Match against int8-quantized encodings, which moves a quarter of
+                  the bytes per scan (needs simsimd or numba; worth it for >10k faces)
         """
         self.known_faces_dir = known_faces_dir
         self.attendance_file = attendance_file
-        self.known_faces = []
-        self.known_names = []
+        self.cache_file = cache_file
+        self.excel_file = excel_file
+        self._df: Optional[pd.DataFrame] = None
+        self._new_rows: List[Dict[str, str]] = []
+        self._seen: Set[Tuple[str, str]] = set()
+        self.use_int8 = use_int8
+        if use_int8 and simsimd is None and distance_kernels is None:
+            # NumPy has no int8 -> int32 distance kernel; upcasting is slower than float32
+            print("⚠ int8 matching needs simsimd or numba; using float32 encodings")
+            self.use_int8 = False
+        self.known_matrix = np.empty((0, 128), dtype=np.float32)
+        self.known_norms = np.empty(0, dtype=np.float32)
+        self.known_i8 = np.empty((0, 128), dtype=np.int8)
+        self.known_names: List[str] = []
         self.load_known_faces()
+        
+        # Compile the distance kernel now rather than on the first capture
+        if distance_kernels is not None:
+            distance_kernels.l2sq_argmin(np.zeros((1, 128), dtype=np.float32), np.zeros(128, dtype=np.float32))
+            if self.use_int8:
+                distance_kernels.l2sq_argmin_int8(np.zeros((1, 128), dtype=np.int8),
+                                                  np.zeros(128, dtype=np.int8))
     
-    def load_known_faces(self):
+    def load_known_faces(self) -> None:
         """
         Load all known faces from the directory
         Filename format: Name_RollNo.jpg (e.g., JohnDoe_101.jpg)
@@ -28,29 +106,172 @@ class AttendanceSystem:
         print("Expected filename format: Name_RollNo.jpg (e.g., JohnDoe_101.jpg)")
         valid_extensions = ('.jpg', '.jpeg', '.png')
         
-        for filename in os.listdir(self.known_faces_dir):
+        cache = self.load_encoding_cache()
+        entries: List[Tuple[Fingerprint, str]] = []
+        pending: List[Tuple[Fingerprint, str]] = []
+        
+        for filename in sorted(os.listdir(self.known_faces_dir)):
             if filename.lower().endswith(valid_extensions):
                 filepath = os.path.join(self.known_faces_dir, filename)
+                # Extract name without extension and parse name_rollno format
+                name_part = os.path.splitext(filename)[0]
                 try:
-                    image = face_recognition.load_image_file(filepath)
-                    encodings = face_recognition.face_encodings(image)
-                    
-                    if len(encodings) > 0:
-                        self.known_faces.append(encodings[0])
-                        # Extract name without extension and parse name_rollno format
-                        name_part = os.path.splitext(filename)[0]
-                        self.known_names.append(name_part)
-                        print(f"✓ Loaded: {name_part}")
-                    else:
-                        print(f"✗ No face detected in: {filename}")
-                except Exception as e:
+                    st = os.stat(filepath)
+                except OSError as e:
                     print(f"✗ Error loading {filename}: {str(e)}")
+                    continue
+                
+                key = (filename, st.st_mtime_ns, st.st_size)
+                entries.append((key, name_part))
+                # Only new or changed files need to be encoded
+                if key not in cache:
+                    pending.append((key, filepath))
+        
+        encoded = self.encode_images(pending)
+        fingerprints: List[Fingerprint] = []
+        encodings_list: List[np.ndarray] = []
+        cache_keys: List[Fingerprint] = []
+        cache_rows: List[np.ndarray] = []
         
-        print(f"\nTotal faces loaded: {len(self.known_faces)}")
+        for key, name_part in entries:
+            if key in encoded:
+                encoding = encoded[key].astype(np.float32)
+                cached = False
+            elif key in cache:
+                encoding = cache[key]
+                cached = True
+            else:
+                continue
+            
+            cache_keys.append(key)
+            cache_rows.append(encoding)
+            if np.isnan(encoding[0]):
+                if cached:
+                    print(f"✗ No face detected in: {key[0]} (cached)")
+                continue
+            
+            encodings_list.append(encoding)
+            fingerprints.append(key)
+            self.known_names.append(name_part)
+            print(f"✓ Loaded (cached): {name_part}" if cached else f"✓ Loaded: {name_part}")
+        
+        # Put frequently marked students first so matching can stop early
+        order = self.frequency_order(self.known_names)
+        self.known_names = [self.known_names[i] for i in order]
+        fingerprints = [fingerprints[i] for i in order]
+        encodings_list = [encodings_list[i] for i in order]
+        
+        if encodings_list:
+            # One aligned float32 matrix so distance calls need no restacking
+            self.known_matrix = self.aligned_matrix(encodings_list)
+            # Squared norms let the NumPy path use one matrix-vector product
+            self.known_norms = np.einsum('ij,ij->i', self.known_matrix, self.known_matrix)
+        if self.use_int8:
+            # Quantize the padded matrix too so row indices stay the same
+            self.known_i8 = self.quantize(self.known_matrix)
+        # Rewrite the cache only if an image was encoded or an entry went away
+        if encoded or len(cache_keys) != len(cache):
+            self.save_encoding_cache(cache_keys, cache_rows)
+        
+        print(f"\nTotal faces loaded: {len(self.known_names)}")
     
-    def capture_image(self):
+    def encode_images(self, pending: List[Tuple[Fingerprint, str]]) -> Dict[Fingerprint, np.ndarray]:
+        """
+        Compute face encodings for images that are not in the cache
+        pending: list of (fingerprint, filepath)
+        Returns: dict mapping fingerprint -> encoding (NO_FACE if none was found);
+        images that could not be read are left out
+        """
+        if pending and dlib.DLIB_USE_CUDA:
+            return self.encode_images_batched(pending)
+        
+        if len(pending) <= 1:
+            encodings = [encode_image_file(item) for item in pending]
+        else:
+            # Separate processes: face_recognition's dlib models are module
+            # globals that are not documented as safe to share between threads
+            workers = min(os.cpu_count() or 1, len(pending))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                encodings = list(executor.map(encode_image_file, pending))
+        
+        return {key: encoding for (key, _), encoding in zip(pending, encodings)
+                if encoding is not None}
+    
+    def encode_images_batched(self, pending: List[Tuple[Fingerprint, str]],
+                              batch_size: int = 32) -> Dict[Fingerprint, np.ndarray]:
+        """
+        Compute face encodings using dlib's CUDA batch detector
+        Images are grouped by size since a batch must share one shape
+        Returns: dict mapping fingerprint -> encoding (NO_FACE if none was found)
+        """
+        groups: Dict[Tuple[int, ...], List[Tuple[Fingerprint, np.ndarray]]] = {}
+        for key, filepath in pending:
+            try:
+                image = self.load_rgb_image(filepath)
+                groups.setdefault(image.shape, []).append((key, image))
+            except Exception as e:
+                print(f"✗ Error loading {key[0]}: {str(e)}")
+        
+        results = {}
+        for group in groups.values():
+            images = [image for _, image in group]
+            try:
+                batch_locations = face_recognition.batch_face_locations(
+                    images, number_of_times_to_upsample=0, batch_size=batch_size)
+            except Exception as e:
+                print(f"✗ Error detecting faces: {str(e)}")
+                continue
+            
+            for (key, image), locations in zip(group, batch_locations):
+                if len(locations) == 0:
+                    print(f"✗ No face detected in: {key[0]}")
+                    results[key] = NO_FACE
+                    continue
+                try:
+                    results[key] = face_recognition.face_encodings(image, locations[:1])[0]
+                except Exception as e:
+                    print(f"✗ Error loading {key[0]}: {str(e)}")
+        return results
+    
+    def load_encoding_cache(self) -> Dict[Fingerprint, np.ndarray]:
+        """
+        Load previously computed encodings from the cache file
+        Returns: dict mapping (filename, mtime_ns, size) -> encoding or NO_FACE
+        """
+        if not os.path.exists(self.cache_file):
+            return {}
+        
+        try:
+            with np.load(self.cache_file) as data:
+                keys = zip(data['filenames'].tolist(),
+                           data['mtimes'].tolist(),
+                           data['sizes'].tolist())
+                return dict(zip(keys, data['encodings']))
+        except Exception as e:
+            print(f"⚠ Ignoring unreadable encoding cache: {str(e)}")
+            return {}
+    
+    def save_encoding_cache(self, fingerprints: List[Fingerprint],
+                            encodings: List[np.ndarray]) -> None:
+        """
+        Save the current encodings so unchanged images are not re-encoded
+        fingerprints: list of (filename, mtime_ns, size), one per image
+        encodings: matching encodings, NO_FACE for images without a face
+        """
+        try:
+            np.savez(self.cache_file,
+                     filenames=np.array([f[0] for f in fingerprints], dtype=str),
+                     mtimes=np.array([f[1] for f in fingerprints], dtype=np.int64),
+                     sizes=np.array([f[2] for f in fingerprints], dtype=np.int64),
+                     encodings=np.array(encodings, dtype=np.float32).reshape(-1, 128))
+        except Exception as e:
+            print(f"⚠ Could not write encoding cache: {str(e)}")
+    
+    def capture_image(self, width: int = 640, height: int = 480,
+                      fps: int = 15) -> Optional[np.ndarray]:
         """
         Capture image from webcam with visual feedback
+        width, height, fps: Requested camera mode (the driver may pick the nearest one)
         """
         cam = cv2.VideoCapture(0)
         
@@ -58,12 +279,20 @@ class AttendanceSystem:
             print("Error: Could not open webcam")
             return None
         
+        # A single close-up face does not need HD frames
+        cam.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cam.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        cam.set(cv2.CAP_PROP_FPS, fps)
+        # Keep only the newest frame so a capture is never a stale one
+        cam.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        
         print("\n--- Camera opened ---")
         print("Position your face in the frame")
         print("Press SPACE to capture")
         print("Press ESC to cancel")
         
         captured_frame = None
+        hud = None
         
         while True:
             ret, frame = cam.read()
@@ -71,20 +300,29 @@ class AttendanceSystem:
                 print("Failed to grab frame")
                 break
             
-            # Add instructions overlay
-            display_frame = frame.copy()
-            cv2.putText(display_frame, "Press SPACE to capture", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 
-                       0.7, (0, 255, 0), 2)
-            cv2.putText(display_frame, "Press ESC to cancel", 
-                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 
-                       0.7, (0, 255, 0), 2)
+            # Render the instructions once, then just add them onto each frame
+            if hud is None or hud.shape[1] != frame.shape[1]:
+                hud = np.zeros((80, frame.shape[1], 3), np.uint8)
+                cv2.putText(hud, "Press SPACE to capture", 
+                           (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 
+                           0.7, (0, 255, 0), 2)
+                cv2.putText(hud, "Press ESC to cancel", 
+                           (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 
+                           0.7, (0, 255, 0), 2)
+            
+            # Add instructions overlay directly; this frame is only for display
+            cv2.add(frame[:80], hud, dst=frame[:80])
             
-            cv2.imshow('Face Recognition Attendance', display_frame)
+            cv2.imshow('Face Recognition Attendance', frame)
             
             key = cv2.waitKey(1) & 0xFF
             if key == ord(' '):  # Space bar
-                captured_frame = frame
+                # Grab a fresh frame without the overlay text for recognition
+                ret, captured_frame = cam.read()
+                if not ret:
+                    captured_frame = None
+                    print("Failed to grab frame")
+                    break
                 print("✓ Image captured!")
                 break
             elif key == 27:  # ESC key
@@ -95,17 +333,23 @@ class AttendanceSystem:
         cv2.destroyAllWindows()
         return captured_frame
     
-    def recognize_face(self, captured_image, tolerance=0.6):
+    def recognize_face(self, captured_image: np.ndarray, tolerance: float = 0.6,
+                       scale: float = 0.5) -> Optional[Tuple[str, str]]:
         """
         Recognize face in the captured image
         tolerance: Lower is more strict (default 0.6)
+        scale: Resize factor applied before detection (default 0.5)
         Returns: tuple (name, roll_no) or None
         """
+        # Shrink the frame first; detection cost grows with pixel count
+        small_image = cv2.resize(captured_image, (0, 0), fx=scale, fy=scale)
+        
         # Convert BGR to RGB (OpenCV uses BGR, face_recognition uses RGB)
-        rgb_image = cv2.cvtColor(captured_image, cv2.COLOR_BGR2RGB)
+        rgb_image = cv2.cvtColor(small_image, cv2.COLOR_BGR2RGB)
         
-        # Find all faces in the image
-        face_locations = face_recognition.face_locations(rgb_image)
+        # Find all faces in the image; a webcam close-up needs no upsampling
+        face_locations = face_recognition.face_locations(rgb_image, number_of_times_to_upsample=0,
+                                                         model='hog')
         face_encodings = face_recognition.face_encodings(rgb_image, face_locations)
         
         if len(face_encodings) == 0:
@@ -117,48 +361,189 @@ class AttendanceSystem:
         
         captured_encoding = face_encodings[0]
         
-        # Compare with known faces
-        face_distances = face_recognition.face_distance(self.known_faces, captured_encoding)
-        matches = face_recognition.compare_faces(self.known_faces, captured_encoding, tolerance=tolerance)
+        # Compare with known faces in a single pass
+        best_match_index, best_distance_sq = self.find_best_match(captured_encoding, tolerance)
         
-        if True in matches:
-            # Get the best match
-            best_match_index = np.argmin(face_distances)
-            if matches[best_match_index]:
-                confidence = 1 - face_distances[best_match_index]
-                full_name = self.known_names[best_match_index]
-                
-                # Parse name and roll number from format: Name_RollNo
-                if '_' in full_name:
-                    parts = full_name.split('_', 1)
-                    name = parts[0]
-                    roll_no = parts[1]
-                else:
-                    # Fallback if no underscore found
-                    name = full_name
-                    roll_no = "N/A"
-                
-                print(f"✓ Face recognized: {name} (Roll No: {roll_no}, Confidence: {confidence:.2%})")
-                return (name, roll_no)
+        if (best_match_index is not None and best_distance_sq is not None
+                and best_distance_sq <= tolerance * tolerance):
+            confidence = 1 - np.sqrt(best_distance_sq)
+            name, roll_no = self.parse_name(self.known_names[best_match_index])
+            
+            print(f"✓ Face recognized: {name} (Roll No: {roll_no}, Confidence: {confidence:.2%})")
+            return (name, roll_no)
         
         print("✗ Face not recognized")
         return None
     
-    def check_duplicate_attendance(self, roll_no, date_str):
+    def find_best_match(self, encoding: np.ndarray, tolerance: float = 0.6,
+                        accept_distance: float = 0.4,
+                        prefix_size: int = 64) -> Tuple[Optional[int], Optional[float]]:
         """
-        Check if attendance already marked for today
+        Find the known face closest to the given encoding
+        The first prefix_size rows (the most frequent students) are scanned first;
+        the rest is skipped if one of them is closer than both accept_distance and
+        tolerance. After such an early exit the returned face is a confident
+        match but not necessarily the nearest one
+        Returns: tuple (index, squared_distance) or (None, None) if no faces are known
+        """
+        if len(self.known_names) == 0:
+            return None, None
+        
+        encoding = np.ascontiguousarray(encoding, dtype=np.float32)
+        if self.use_int8:
+            encoding = self.quantize(encoding)
+        accept = min(accept_distance, tolerance)
+        total = len(self.known_matrix)
+        
+        best_index, best_distance_sq = self.scan_rows(0, prefix_size, encoding)
+        if best_distance_sq < accept * accept or prefix_size >= total:
+            return best_index, best_distance_sq
+        
+        # No confident match among frequent students: scan the rest in one call
+        index, distance_sq = self.scan_rows(prefix_size, total, encoding)
+        if distance_sq < best_distance_sq:
+            return prefix_size + index, distance_sq
+        return best_index, best_distance_sq
+    
+    def scan_rows(self, start: int, stop: int, encoding: np.ndarray) -> Tuple[int, float]:
+        """
+        Find the closest of known_matrix[start:stop] with the fastest available backend
+        encoding: float32 query, or an int8 one from quantize() when use_int8 is set
+        Returns: tuple (index relative to start, squared_distance)
+        """
+        if self.use_int8:
+            return self.scan_rows_int8(start, stop, encoding)
+        
+        rows = self.known_matrix[start:stop]
+        if simsimd is not None:
+            distances_sq = np.asarray(simsimd.cdist(rows, encoding.reshape(1, -1),
+                                                    metric='sqeuclidean')).ravel()
+            index = int(distances_sq.argmin())
+            return index, float(distances_sq[index])
+        
+        if distance_kernels is not None:
+            index, distance_sq = distance_kernels.l2sq_argmin(rows, encoding)
+            return int(index), float(distance_sq)
+        
+        # ||a||^2 + ||b||^2 - 2*a.b turns the range into one matrix-vector product
+        dots = rows @ encoding
+        query_norm = float(encoding @ encoding)
+        distances_sq = self.known_norms[start:stop] + query_norm - 2.0 * dots
+        index = int(distances_sq.argmin())
+        # Rounding can push an exact match slightly below zero
+        return index, max(float(distances_sq[index]), 0.0)
+    
+    def scan_rows_int8(self, start: int, stop: int, query: np.ndarray) -> Tuple[int, float]:
+        """
+        Same as scan_rows, but over the int8-quantized encodings
+        Differences are accumulated in int32 straight from the int8 rows,
+        without upcasting the matrix first
+        """
+        rows = self.known_i8[start:stop]
+        if simsimd is not None:
+            distances_sq = np.asarray(simsimd.cdist(rows, query.reshape(1, -1),
+                                                    metric='sqeuclidean')).ravel()
+            index = int(distances_sq.argmin())
+            distance_sq = float(distances_sq[index])
+        else:
+            index, distance_sq = distance_kernels.l2sq_argmin_int8(rows, query)
+            index, distance_sq = int(index), float(distance_sq)
+        return index, distance_sq / (127.0 * 127.0)
+    
+    def frequency_order(self, names: List[str]) -> List[int]:
+        """
+        Order known faces by how often they appear in the attendance log
+        Returns: list of indices into names, most frequent first
+        """
+        if len(names) < 2:
+            return list(range(len(names)))
+        
+        counts = self._ensure_loaded()["Roll No"].value_counts()
+        frequency = [counts.get(self.parse_name(name)[1], 0) for name in names]
+        return sorted(range(len(names)), key=lambda i: -frequency[i])
+    
+    @staticmethod
+    def parse_name(full_name: str) -> Tuple[str, str]:
+        """
+        Parse name and roll number from format: Name_RollNo
+        Returns: tuple (name, roll_no)
+        """
+        if '_' in full_name:
+            name, roll_no = full_name.split('_', 1)
+            return name, roll_no
+        # Fallback if no underscore found
+        return full_name, "N/A"
+    
+    @staticmethod
+    def load_rgb_image(filepath: str) -> np.ndarray:
+        """
+        Read an image file as an RGB array
+        OpenCV's decoder is faster than PIL's and avoids an extra copy.
+        The bytes are read with NumPy because cv2.imread cannot open
+        non-ASCII paths (e.g. student names) on Windows
+        """
+        image = cv2.imdecode(np.fromfile(filepath, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("Could not read image")
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    
+    @staticmethod
+    def aligned_matrix(rows: Sequence[np.ndarray], alignment: int = 64,
+                       row_multiple: int = 16) -> np.ndarray:
+        """
+        Stack encodings into a float32 matrix whose data starts on an alignment
+        byte boundary, padded with PAD_VALUE rows up to a multiple of row_multiple
+        so SIMD kernels need no unaligned loads or scalar tail loop
+        """
+        count = len(rows)
+        padded = -(-count // row_multiple) * row_multiple
+        itemsize = np.dtype(np.float32).itemsize
+        buffer = np.empty(padded * 128 + alignment // itemsize, dtype=np.float32)
+        offset = (-buffer.ctypes.data % alignment) // itemsize
+        matrix = buffer[offset:offset + padded * 128].reshape(padded, 128)
+        matrix[:count] = rows
+        matrix[count:] = PAD_VALUE
+        return matrix
+    
+    @staticmethod
+    def quantize(encodings: np.ndarray) -> np.ndarray:
+        """
+        Scale encodings by 127 and round them to int8
+        """
+        return np.clip(np.round(encodings * 127), -127, 127).astype(np.int8)
+    
+    def _ensure_loaded(self) -> pd.DataFrame:
         """
+        Read the attendance log into memory once per session
+        An existing Excel file is imported if the CSV log does not exist yet
+        Returns: the attendance records loaded so far
+        """
+        if self._df is not None:
+            return self._df
+        
+        if not os.path.exists(self.attendance_file) and os.path.exists(self.excel_file):
+            df = pd.read_excel(self.excel_file, dtype=str)
+            df.to_csv(self.attendance_file, index=False, columns=ATTENDANCE_COLUMNS)
+            print(f"✓ Imported existing records from {self.excel_file}")
+        
         try:
-            df = pd.read_excel(self.attendance_file)
-            # Check if student already marked attendance today
-            duplicate = df[(df['Roll No'] == roll_no) & (df['Date'] == date_str)]
-            return len(duplicate) > 0
+            df = pd.read_csv(self.attendance_file, dtype=str)
         except FileNotFoundError:
-            return False
+            df = pd.DataFrame(columns=ATTENDANCE_COLUMNS)
+        self._df = df
+        self._seen = set(zip(df["Roll No"], df["Date"]))
+        return df
     
-    def mark_attendance(self, student_name, roll_no):
+    def check_duplicate_attendance(self, roll_no: str, date_str: str) -> bool:
         """
-        Mark attendance in Excel file with Name and Roll No
+        Check if attendance already marked for today
+        """
+        self._ensure_loaded()
+        return (str(roll_no), date_str) in self._seen
+    
+    def mark_attendance(self, student_name: str, roll_no: str) -> bool:
+        """
+        Mark attendance in the CSV log with Name and Roll No
         """
         now = datetime.now()
         current_date = now.strftime("%Y-%m-%d")
@@ -169,33 +554,54 @@ class AttendanceSystem:
             print(f"⚠ Attendance already marked for {student_name} (Roll No: {roll_no}) today!")
             return False
         
-        try:
-            # Try to read existing file
-            df = pd.read_excel(self.attendance_file)
-        except FileNotFoundError:
-            # Create new DataFrame if file doesn't exist with correct column order
-            df = pd.DataFrame(columns=["Roll No", "Name", "Date", "Time"])
+        # Append a single row; write the header only for a new file
+        write_header = not os.path.exists(self.attendance_file)
+        with open(self.attendance_file, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(ATTENDANCE_COLUMNS)
+            writer.writerow([roll_no, student_name, current_date, current_time])
+        self._new_rows.append({"Roll No": str(roll_no), "Name": student_name,
+                               "Date": current_date, "Time": current_time})
+        self._seen.add((str(roll_no), current_date))
+        
+        print(f"✓ Attendance marked for {student_name} (Roll No: {roll_no}) at {current_time}")
+        return True
+    
+    def export_xlsx(self) -> bool:
+        """
+        Write the in-memory attendance records to the Excel file
+        Returns: True if the file was written
+        """
+        df = self._ensure_loaded()
         
-        # Create new record with correct column order
-        new_record = pd.DataFrame({
-            "Roll No": [roll_no],
-            "Name": [student_name],
-            "Date": [current_date],
-            "Time": [current_time]
-        })
+        # Fold this session's rows into the loaded records in a single step
+        if self._new_rows:
+            new_df = pd.DataFrame(self._new_rows, columns=ATTENDANCE_COLUMNS)
+            df = new_df if df.empty else pd.concat([df, new_df], ignore_index=True)
+            self._df = df
+            self._new_rows = []
         
-        # Concatenate and save
-        df = pd.concat([df, new_record], ignore_index=True)
-        df.to_excel(self.attendance_file, index=False)
+        if df.empty:
+            print("No attendance records to export")
+            return False
         
-        print(f"✓ Attendance marked for {student_name} (Roll No: {roll_no}) at {current_time}")
+        # Stream rows straight to disk instead of building the sheet in memory.
+        # constant_memory mode only accepts rows in order, so write them directly
+        # rather than through DataFrame.to_excel (which writes column by column)
+        with xlsxwriter.Workbook(self.excel_file, {'constant_memory': True}) as workbook:
+            sheet = workbook.add_worksheet()
+            sheet.write_row(0, 0, df.columns)
+            for row_index, row in enumerate(df.fillna('').itertuples(index=False), start=1):
+                sheet.write_row(row_index, 0, row)
+        print(f"✓ Attendance exported to {self.excel_file}")
         return True
     
-    def run(self):
+    def run(self) -> None:
         """
         Main execution method
         """
-        if len(self.known_faces) == 0:
+        if len(self.known_names) == 0:
             print("Error: No known faces loaded. Please add face images to the known_faces directory.")
             return
         
@@ -213,21 +619,24 @@ class AttendanceSystem:
         
         student_name, roll_no = result
         
-        # Mark attendance
-        self.mark_attendance(student_name, roll_no)
+        # Mark attendance and refresh the Excel copy once for the session
+        if self.mark_attendance(student_name, roll_no):
+            self.export_xlsx()
 
 
-def main():
+def main() -> None:
     """
     Main function to run the attendance system
     """
     # Configuration
     known_faces_dir = r'C:\Users\LENOVO\Downloads\Attendence with face\known_faces'
-    attendance_file = 'attendance.xlsx'
+    attendance_file = 'attendance.csv'
+    excel_file = 'attendance.xlsx'
     
     try:
         # Initialize and run the system
-        system = AttendanceSystem(known_faces_dir, attendance_file)
+        system = AttendanceSystem(known_faces_dir, attendance_file,
+                                  excel_file=excel_file)
         system.run()
     except Exception as e:
         print(f"Error: {str(e)}")